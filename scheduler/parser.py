@@ -1,15 +1,31 @@
+import functools
 import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
 
 
+@functools.lru_cache(maxsize=16)
+def _read_cached(path_str: str, mtime_ns: int) -> bytes:
+    # Keyed on mtime so an edited file is read again; callers mutate the parsed
+    # data, so only the raw bytes are shared and every load decodes fresh objects.
+    with open(path_str, "rb") as f:
+        return f.read()
+
+
 def _load_json(path: Path) -> Any:
     if not path.exists():
         raise FileNotFoundError(f"File '{path.name}' not found in {path.parent}")
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    data = _read_cached(str(path), path.stat().st_mtime_ns)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 # ===== Loaders =====
@@ -86,3 +102,26 @@ def load_all_data(
     validate_constraints(constraints)
 
     return staff, shifts, constraints
+
+
+# ===== Lazy Module Attributes =====
+
+_LAZY_LOADERS = {
+    "staff": load_staff,
+    "shifts": load_shifts,
+    "constraints": load_constraints,
+}
+_cache: dict[str, Any] = {}
+
+
+def __getattr__(name: str) -> Any:
+    """Exposes `parser.staff`, `parser.shifts` and `parser.constraints`.
+
+    Each is loaded from the default data directory on first access and shared
+    afterwards, so callers that mutate the data should use the loaders instead.
+    """
+    if name not in _LAZY_LOADERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name not in _cache:
+        _cache[name] = _LAZY_LOADERS[name]()
+    return _cache[name]
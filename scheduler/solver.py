@@ -1,5 +1,7 @@
+import itertools
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -7,6 +9,11 @@ from ortools.sat.python import cp_model
 
 from scheduler.parser import load_all_data
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
@@ -14,9 +21,67 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
-def generate_schedule():
-    log.info("Loading input data...")
-    staff_list, shift_list, constraints_data = load_all_data()
+def _greedy_assignment(shift_list, eligible_by_role, max_shifts_per_week):
+    """Greedy (staff_id, shift_id) assignment used to warm-start the solver.
+
+    Fills the hardest-to-staff requirements first, preferring staff with the
+    required skills, while respecting the weekly shift cap and one shift per day.
+    """
+    requirements = [
+        (shift, role_req)
+        for shift in shift_list
+        for role_req in shift["required_roles"]
+    ]
+    requirements.sort(key=lambda r: len(eligible_by_role[(r[0]["id"], r[1]["role"])]))
+
+    assigned = set()
+    shift_counts = {}
+    working_days = set()
+    for shift, role_req in requirements:
+        required_skills = set(role_req.get("skills_required", []))
+        candidates = sorted(
+            eligible_by_role[(shift["id"], role_req["role"])],
+            key=lambda s: -len(required_skills.intersection(s.get("skills", []))),
+        )
+        filled = 0
+        for s in candidates:
+            if filled >= role_req["count"]:
+                break
+            s_id = s["id"]
+            if (
+                shift_counts.get(s_id, 0) >= max_shifts_per_week
+                or (s_id, shift["date"]) in working_days
+            ):
+                continue
+            assigned.add((s_id, shift["id"]))
+            shift_counts[s_id] = shift_counts.get(s_id, 0) + 1
+            working_days.add((s_id, shift["date"]))
+            filled += 1
+    return assigned
+
+
+def _write_json(path, data):
+    """Serialize `data` to bytes up front and write it with raw os.write calls."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _solve_schedule(data=None):
+    """Builds and solves the model; returns an assignment iterator or None."""
+    if data is None:
+        log.info("Loading input data...")
+        data = load_all_data()
+    staff_list, shift_list, constraints_data = data
     log.info(f"Loaded {len(staff_list)} staff members")
     log.info(f"Loaded {len(shift_list)} shifts")
 
@@ -32,34 +97,76 @@ def generate_schedule():
     staff_ids = [s["id"] for s in staff_list]
     shift_ids = [s["id"] for s in shift_list]
 
+    # Lookups shared by every staff member, built once up front
+    shifts_by_date = {}
+    for sh in shift_list:
+        shifts_by_date.setdefault(sh["date"], []).append(sh)
+    shift_by_id = {sh["id"]: sh for sh in shift_list}
+    night_shift_ids = {sh["id"] for sh in shift_list if sh["shift_type"] == "night"}
+    # (unavailable_days, unavailable_shifts, skills) per staff id
+    staff_meta = {
+        s["id"]: (
+            frozenset(s.get("unavailable_days", [])),
+            frozenset(s.get("unavailable_shifts", [])),
+            frozenset(s.get("skills", [])),
+        )
+        for s in staff_list
+    }
+    staff_by_role = {}
+    for s in staff_list:
+        staff_by_role.setdefault(s["role"], []).append(s)
+    # Inverted unavailability: staff ids blocked per date and per shift id
+    blocked_by_date = {}
+    blocked_by_shift = {}
+    for s_id, (unavail_days, unavail_shifts, _skills) in staff_meta.items():
+        for day in unavail_days:
+            blocked_by_date.setdefault(day, set()).add(s_id)
+        for sh_id in unavail_shifts:
+            blocked_by_shift.setdefault(sh_id, set()).add(s_id)
+
     # Decision Variables
+    # Only (staff, shift) pairs with a matching role and no unavailability get a
+    # variable; a missing key means the assignment is forbidden.
     log.info("Creating decision variables...")
-    shift_assignments = {
-        (s_id, sh_id): model.NewBoolVar(f"{s_id}_works_{sh_id}")
-        for s_id in staff_ids
-        for sh_id in shift_ids
-    }
+    shift_assignments = {}
+    shifts_per_staff = {s_id: [] for s_id in staff_ids}
+    eligible_by_role = {}
+    for shift in shift_list:
+        shift_id = shift["id"]
+        blocked = blocked_by_date.get(shift["date"], set()) | blocked_by_shift.get(
+            shift_id, set()
+        )
+        for role_req in shift["required_roles"]:
+            role = role_req["role"]
+            eligible_staff = [
+                s for s in staff_by_role.get(role, []) if s["id"] not in blocked
+            ]
+            eligible_by_role[(shift_id, role)] = eligible_staff
+            for s in eligible_staff:
+                key = (s["id"], shift_id)
+                if key not in shift_assignments:
+                    shift_assignments[key] = model.NewBoolVar(
+                        f"{s['id']}_works_{shift_id}"
+                    )
+                    shifts_per_staff[s["id"]].append(shift_id)
+    log.info(
+        f"Created {len(shift_assignments)} of {len(staff_ids) * len(shift_ids)} possible assignment variables"
+    )
 
-    # Objective terms for soft constraints
-    objective_terms = []
+    # Objective terms for soft constraints, kept as parallel var/coefficient lists
+    obj_vars = []
+    obj_coefs = []
 
     # HARD CONSTRAINTS
     log.info("Applying hard constraints...")
     for shift in shift_list:
         shift_id = shift["id"]
-        shift_date = shift["date"]
         for role_req in shift["required_roles"]:
             role = role_req["role"]
             required_count = role_req["count"]
             required_skills = role_req.get("skills_required", [])
 
-            eligible_staff = [
-                s
-                for s in staff_list
-                if s["role"] == role
-                and shift_date not in s.get("unavailable_days", [])
-                and shift_id not in s.get("unavailable_shifts", [])
-            ]
+            eligible_staff = eligible_by_role[(shift_id, role)]
             eligible_ids = [s["id"] for s in eligible_staff]
             log.info(
                 f"Shift {shift_id} requires {required_count} x {role}. Eligible: {eligible_ids}"
@@ -73,23 +180,22 @@ def generate_schedule():
             assigned_sum = model.NewIntVar(
                 0, len(eligible_ids), f"{shift_id}_{role}_assigned"
             )
-            model.Add(assigned_sum == sum(assigned))
+            model.Add(assigned_sum == cp_model.LinearExpr.Sum(assigned))
 
             shortage = model.NewIntVar(0, required_count, f"{shift_id}_{role}_shortage")
             model.Add(shortage == required_count - assigned_sum)
-            objective_terms.append(
-                shortage * soft_constraints["understaffed_shift_penalty"]
-            )
+            obj_vars.append(shortage)
+            obj_coefs.append(soft_constraints["understaffed_shift_penalty"])
 
             # Skill coverage
             for skill in required_skills:
                 staff_with_skill = [
                     shift_assignments[(s["id"], shift_id)]
                     for s in eligible_staff
-                    if skill in s.get("skills", [])
+                    if skill in staff_meta[s["id"]][2]
                 ]
                 if staff_with_skill:
-                    model.Add(sum(staff_with_skill) >= 1)
+                    model.Add(cp_model.LinearExpr.Sum(staff_with_skill) >= 1)
                 else:
                     log.warning(
                         f"No eligible {role} has skill '{skill}' for shift {shift_id}"
@@ -98,29 +204,23 @@ def generate_schedule():
                         0, 1, f"{shift_id}_{role}_{skill}_mismatch"
                     )
                     model.Add(penalty == 1)
-                    objective_terms.append(
-                        penalty * soft_constraints["skill_mismatch_penalty"]
-                    )
+                    obj_vars.append(penalty)
+                    obj_coefs.append(soft_constraints["skill_mismatch_penalty"])
 
     # One shift per day per staff
     log.info("Applying one-shift-per-day constraint...")
-    for s in staff_list:
-        s_id = s["id"]
-        shifts_by_date = {}
-        for sh in shift_list:
-            shifts_by_date.setdefault(sh["date"], []).append(sh)
+    for s_id in staff_ids:
         for _date, shifts in shifts_by_date.items():
-            model.Add(sum(shift_assignments[(s_id, sh["id"])] for sh in shifts) <= 1)
-
-    # Enforce unavailability
-    log.info("Enforcing staff availability constraints...")
-    for s in staff_list:
-        s_id = s["id"]
-        for sh in shift_list:
-            if sh["date"] in s.get("unavailable_days", []) or sh["id"] in s.get(
-                "unavailable_shifts", []
-            ):
-                model.Add(shift_assignments[(s_id, sh["id"])] == 0)
+            if len(shifts) <= 1:
+                continue
+            day_vars = [
+                shift_assignments[(s_id, sh["id"])]
+                for sh in shifts
+                if (s_id, sh["id"]) in shift_assignments
+            ]
+            # A single BoolVar is always <= 1, so only real choices need a constraint
+            if len(day_vars) > 1:
+                model.Add(cp_model.LinearExpr.Sum(day_vars) <= 1)
 
     # SOFT CONSTRAINTS
     log.info("Adding soft constraints to objective function...")
@@ -130,79 +230,158 @@ def generate_schedule():
         max_hours = s.get("max_hours_per_week", hard_constraints["max_hours_per_week"])
         min_hours = s.get("min_hours_per_week", 0)
 
-        total_hours = sum(
-            shift_duration * shift_assignments[(s_id, sh_id)] for sh_id in shift_ids
+        staff_shift_ids = shifts_per_staff[s_id]
+        staff_vars = [shift_assignments[(s_id, sh_id)] for sh_id in staff_shift_ids]
+
+        # Bind the weekly hours to one IntVar so both penalties share it
+        total_hours = model.NewIntVar(
+            0, shift_duration * len(staff_vars), f"{s_id}_total_hours"
+        )
+        model.Add(
+            total_hours
+            == cp_model.LinearExpr.WeightedSum(
+                staff_vars, [shift_duration] * len(staff_vars)
+            )
         )
 
         # Preferred shift bonus
-        for sh in shift_list:
-            if sh["shift_type"] in preferred_shifts:
-                objective_terms.append(
-                    -soft_constraints["preferred_shift_match"]
-                    * shift_assignments[(s_id, sh["id"])]
-                )
+        for sh_id in staff_shift_ids:
+            if shift_by_id[sh_id]["shift_type"] in preferred_shifts:
+                obj_vars.append(shift_assignments[(s_id, sh_id)])
+                obj_coefs.append(-soft_constraints["preferred_shift_match"])
 
         # Overtime penalty
-        overtime = model.NewIntVar(0, 1000, f"{s_id}_overtime")
-        model.Add(total_hours - max_hours <= overtime)
+        max_overtime = max(0, shift_duration * len(staff_vars) - max_hours)
+        overtime = model.NewIntVar(0, max_overtime, f"{s_id}_overtime")
         model.AddMaxEquality(overtime, [total_hours - max_hours, 0])
-        objective_terms.append(overtime * soft_constraints["overtime_penalty"])
+        obj_vars.append(overtime)
+        obj_coefs.append(soft_constraints["overtime_penalty"])
 
         # Underscheduling penalty
-        underscheduled = model.NewIntVar(0, 1000, f"{s_id}_underscheduled")
-        model.Add(min_hours - total_hours <= underscheduled)
+        underscheduled = model.NewIntVar(0, max(0, min_hours), f"{s_id}_underscheduled")
         model.AddMaxEquality(underscheduled, [min_hours - total_hours, 0])
-        objective_terms.append(
-            underscheduled * soft_constraints["underscheduling_penalty"]
-        )
-        
+        obj_vars.append(underscheduled)
+        obj_coefs.append(soft_constraints["underscheduling_penalty"])
+
         # Night shift soft limit
         max_night_shifts = hard_constraints.get("night_shift_limit_per_week", 2)
         night_shifts = [
-            shift_assignments[(s_id, sh["id"])]
-            for sh in shift_list
-            if sh["shift_type"] == "night"
+            shift_assignments[(s_id, sh_id)]
+            for sh_id in staff_shift_ids
+            if sh_id in night_shift_ids
         ]
-        total_night_shifts = sum(night_shifts)
+        total_night_shifts = cp_model.LinearExpr.Sum(night_shifts)
 
         excess_night = model.NewIntVar(0, len(night_shifts), f"{s_id}_excess_night")
-        model.Add(total_night_shifts - max_night_shifts <= excess_night)
         model.AddMaxEquality(excess_night, [total_night_shifts - max_night_shifts, 0])
-        objective_terms.append(
-            excess_night * soft_constraints["max_night_shifts_penalty"]
+        obj_vars.append(excess_night)
+        obj_coefs.append(soft_constraints["max_night_shifts_penalty"])
+
+    # Symmetry breaking
+    # Staff identical in every attribute the model reads are interchangeable, so
+    # ordering each class by number of shifts worked removes swapped duplicates.
+    log.info("Breaking symmetry between interchangeable staff...")
+    staff_classes = {}
+    for s in staff_list:
+        key = (
+            s["role"],
+            staff_meta[s["id"]],
+            frozenset(s.get("preferred_shifts", [])),
+            s.get("max_hours_per_week", hard_constraints["max_hours_per_week"]),
+            s.get("min_hours_per_week", 0),
         )
+        staff_classes.setdefault(key, []).append(s["id"])
+    class_sizes = sorted(
+        (len(ids) for ids in staff_classes.values() if len(ids) > 1), reverse=True
+    )
+    log.info(f"Interchangeable staff classes: {class_sizes or 'none'}")
+    for ids in staff_classes.values():
+        ids.sort()
+        for a_id, b_id in itertools.pairwise(ids):
+            a_vars = [
+                shift_assignments[(a_id, sh_id)] for sh_id in shifts_per_staff[a_id]
+            ]
+            b_vars = [
+                shift_assignments[(b_id, sh_id)] for sh_id in shifts_per_staff[b_id]
+            ]
+            model.Add(
+                cp_model.LinearExpr.Sum(a_vars) >= cp_model.LinearExpr.Sum(b_vars)
+            )
 
     # Set Objective
-    model.Minimize(sum(objective_terms))
+    model.Minimize(cp_model.LinearExpr.WeightedSum(obj_vars, obj_coefs))
+
+    # Warm start from a greedy schedule
+    log.info("Adding greedy solution hint...")
+    hint = _greedy_assignment(
+        shift_list, eligible_by_role, hard_constraints["max_shifts_per_week"]
+    )
+    for key, var in shift_assignments.items():
+        model.AddHint(var, int(key in hint))
 
     # Solve
     log.info("Solving...")
-    solver.parameters.max_time_in_seconds = 10.0
+    solver_config = constraints_data.get("solver_config", {})
+    solver.parameters.max_time_in_seconds = solver_config.get("time_limit_s", 10.0)
+    solver.parameters.num_workers = solver_config.get(
+        "num_workers", max(4, os.cpu_count() or 1)
+    )
+    solver.parameters.stop_after_first_solution = solver_config.get(
+        "first_solution_only", False
+    )
+    solver.parameters.log_search_progress = False
+    solver.parameters.linearization_level = 2
     status = solver.Solve(model)
 
-    if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        log.info("Schedule generated successfully.")
-        result = []
-        for shift in shift_list:
-            assigned_staff = []
-            for s in staff_list:
-                if solver.BooleanValue(shift_assignments[(s["id"], shift["id"])]):
-                    assigned_staff.append(s["id"])
-                    log.info(
-                        f"Assigned {s['id']} to shift {shift['id']} ({shift['shift_type']})"
-                    )
-            result.append({"shift_id": shift["id"], "staff_ids": assigned_staff})
-
-        output_path = Path("output/assignments.json")
-        output_path.parent.mkdir(exist_ok=True)
-        with open(output_path, "w") as f:
-            json.dump(result, f, indent=2)
-        log.info(f"Schedule saved to {output_path}")
-        return result
-    else:
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
         log.warning("No feasible solution found.")
         return None
 
+    log.info("Schedule generated successfully.")
+    return _iter_assignments(solver, staff_list, shift_list, shift_assignments)
+
+
+def _iter_assignments(solver, staff_list, shift_list, shift_assignments):
+    for shift in shift_list:
+        assigned_staff = []
+        for s in staff_list:
+            key = (s["id"], shift["id"])
+            if key in shift_assignments and solver.BooleanValue(shift_assignments[key]):
+                assigned_staff.append(s["id"])
+                log.info(
+                    f"Assigned {s['id']} to shift {shift['id']} ({shift['shift_type']})"
+                )
+        yield {"shift_id": shift["id"], "staff_ids": assigned_staff}
+
+
+def generate_schedule_iter(data=None):
+    """Solves the schedule and yields one assignment per shift.
+
+    Unlike `generate_schedule()`, nothing is written to disk and an infeasible
+    model simply yields nothing.
+    """
+    assignments = _solve_schedule(data)
+    if assignments is not None:
+        yield from assignments
+
+
+def generate_schedule(data=None):
+    """Solves the schedule, saves it to output/assignments.json and returns it.
+
+    `data` is an optional `(staff, shifts, constraints)` tuple; when omitted the
+    inputs are read with `load_all_data()`.
+    """
+    assignments = _solve_schedule(data)
+    if assignments is None:
+        return None
+
+    result = list(assignments)
+    output_path = Path("output/assignments.json")
+    output_path.parent.mkdir(exist_ok=True)
+    _write_json(output_path, result)
+    log.info(f"Schedule saved to {output_path}")
+    return result
+
 
 if __name__ == "__main__":
     start = datetime.now()
@@ -0,0 +1,101 @@
+import copy
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from scheduler import parser, solver
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+_WARMUP_DATA = (
+    [{"id": "s0", "name": "Warmup", "role": "nurse"}],
+    [
+        {
+            "id": "sh0",
+            "date": "2025-01-01",
+            "shift_type": "morning",
+            "required_roles": [{"role": "nurse", "count": 1}],
+        }
+    ],
+    {
+        "hard_constraints": {"max_hours_per_week": 8, "max_shifts_per_week": 1},
+        "shift_config": {},
+        "soft_constraints": {
+            "weights": {
+                "preferred_shift_match": 0,
+                "overtime_penalty": 0,
+                "underscheduling_penalty": 0,
+                "understaffed_shift_penalty": 1,
+                "skill_mismatch_penalty": 0,
+                "max_night_shifts_penalty": 0,
+            }
+        },
+    },
+)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _warm_solver():
+    """Pays CP-SAT's first-solve setup cost once, on a one-shift problem."""
+    list(solver.generate_schedule_iter(data=_WARMUP_DATA))
+
+
+@pytest.fixture(scope="session")
+def basic_bundle():
+    """Basic staff/shifts/constraints, parsed once and shared by every test."""
+    return parser.load_all_data(
+        TEST_DATA_DIR, "staff_basic.json", "shifts_basic.json", "constraints_basic.json"
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class Staff:
+    """Read-only attribute view of a staff record for assertion loops."""
+
+    id: str
+    name: str
+    role: str
+    unavailable_days: frozenset[str]
+    unavailable_shifts: frozenset[str]
+    min_hours_per_week: int = 0
+
+    @classmethod
+    def from_dict(cls, s):
+        return cls(
+            id=s["id"],
+            name=s["name"],
+            role=s["role"],
+            unavailable_days=frozenset(s.get("unavailable_days", [])),
+            unavailable_shifts=frozenset(s.get("unavailable_shifts", [])),
+            min_hours_per_week=s.get("min_hours_per_week", 0),
+        )
+
+
+@pytest.fixture(scope="session")
+def _raw_unavailable():
+    return parser.load_all_data(
+        TEST_DATA_DIR,
+        "staff_unavailable.json",
+        "shifts_basic.json",
+        "constraints_basic.json",
+    )
+
+
+@pytest.fixture(scope="session")
+def unavailable_staff(_raw_unavailable):
+    """`Staff` views of the unavailable-staff data set; the dicts stay solver input."""
+    staff, _, _ = _raw_unavailable
+    return [Staff.from_dict(s) for s in staff]
+
+
+@pytest.fixture(scope="session")
+def basic_schedule(basic_bundle):
+    """The solver's schedule for `basic_bundle`, computed once per session."""
+    return solver.generate_schedule(data=basic_bundle)
+
+
+@pytest.fixture
+def unavailable_data(_raw_unavailable):
+    return copy.deepcopy(_raw_unavailable)
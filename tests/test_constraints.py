@@ -1,89 +1,88 @@
+from collections import Counter
 from pathlib import Path
 
 from scheduler import parser, solver
 
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
 
-def test_night_shift_soft_constraint():
-    data_dir = Path(__file__).parent / "test_data"
 
+def test_night_shift_soft_constraint():
     staff, shifts, constraints = parser.load_all_data(
-        data_dir=data_dir,
+        data_dir=TEST_DATA_DIR,
         staff_file="staff_basic.json",  # or staff_night_limited.json if exists
         shifts_file="shifts_night_only.json",
         constraints_file="constraints_soft_night_penalty.json",
     )
 
-    solver.load_all_data = lambda: (staff, shifts, constraints)
-
-    result = solver.generate_schedule()
-    assert result is not None
-
     # Check if staff aren not over-assigned to night shifts beyond soft limits
-    night_shift_count = {staff_member["id"]: 0 for staff_member in staff}
-
-    for entry in result:
-        shift = next(s for s in shifts if s["id"] == entry["shift_id"])
-        if shift["shift_type"] == "night":
-            for sid in entry["staff_ids"]:
-                night_shift_count[sid] += 1
-
-    for _sid, count in night_shift_count.items():
-        assert (
-            count
-            <= constraints["hard_constraints"].get("night_shift_limit_per_week", 2) + 1
-        )  # +1 to allow for soft constraint flexibility
-
-
-def test_unavailable_staff_never_scheduled():
-    data_dir = Path(__file__).parent / "test_data"
-
-    staff, shifts, constraints = parser.load_all_data(
-        data_dir=data_dir,
-        staff_file="staff_unavailable.json",
-        shifts_file="shifts_basic.json",
-        constraints_file="constraints_basic.json",
-    )
-
-    solver.load_all_data = lambda: (staff, shifts, constraints)
-    result = solver.generate_schedule()
-    assert result is not None
-
-    # Build shift lookup by ID
-    shift_lookup = {s["id"]: s for s in shifts}
-
-    for assignment in result:
+    night_shift_ids = {s["id"] for s in shifts if s["shift_type"] == "night"}
+    # +1 to allow for soft constraint flexibility
+    limit = constraints["hard_constraints"].get("night_shift_limit_per_week", 2) + 1
+    night_shift_count = Counter()
+    scheduled = 0
+
+    for entry in solver.generate_schedule_iter(data=(staff, shifts, constraints)):
+        scheduled += 1
+        if entry["shift_id"] in night_shift_ids:
+            night_shift_count.update(entry["staff_ids"])
+
+    assert scheduled == len(shifts)
+
+    # Staff without night shifts are absent from the Counter and trivially pass
+    for sid, count in night_shift_count.items():
+        assert count <= limit, f"Staff {sid} has {count} night shifts (limit {limit})"
+
+
+def test_unavailable_staff_never_scheduled(unavailable_data, unavailable_staff):
+    staff, shifts, constraints = unavailable_data
+
+    # Index, per shift, the staff who must not work it; staff without any
+    # unavailability can never be in it, so they are skipped up front
+    restricted_staff = [
+        s for s in unavailable_staff if s.unavailable_days or s.unavailable_shifts
+    ]
+    forbidden_by_shift = {
+        shift["id"]: {
+            s.id
+            for s in restricted_staff
+            if shift["date"] in s.unavailable_days
+            or shift["id"] in s.unavailable_shifts
+        }
+        for shift in shifts
+    }
+
+    scheduled = 0
+    for assignment in solver.generate_schedule_iter(data=(staff, shifts, constraints)):
+        scheduled += 1
         shift_id = assignment["shift_id"]
-        shift = shift_lookup[shift_id]
-        shift_date = shift["date"]
-
-        for sid in assignment["staff_ids"]:
-            staff_member = next(s for s in staff if s["id"] == sid)
-            unavailable_days = staff_member.get("unavailable_days", [])
-            unavailable_shifts = staff_member.get("unavailable_shifts", [])
-
-            assert shift_date not in unavailable_days, (
-                f"Staff {sid} was scheduled on unavailable day {shift_date} for shift {shift_id}"
-            )
-            assert shift_id not in unavailable_shifts, (
-                f"Staff {sid} was scheduled for unavailable shift {shift_id}"
-            )
-
-
-def test_underscheduling_penalty_effect():
-    data_dir = Path(__file__).parent / "test_data"
-
-    staff, shifts, constraints = parser.load_all_data(
-        data_dir=data_dir,
-        staff_file="staff_basic.json",
-        shifts_file="shifts_basic.json",
-        constraints_file="constraints_basic.json",
-    )
-
-    for s in staff:
-        s["min_hours_per_week"] = 40  # Force high expected hours
-
-    solver.load_all_data = lambda: (staff, shifts, constraints)
-    result = solver.generate_schedule()
+        violations = set(assignment["staff_ids"]) & forbidden_by_shift[shift_id]
+        assert not violations, (
+            f"Staff {sorted(violations)} were scheduled for unavailable shift {shift_id}"
+        )
+
+    assert scheduled == len(shifts)
+
+
+def test_underscheduling_penalty_effect(basic_bundle):
+    staff_template, shift_template, constraint_template = basic_bundle
+
+    # A smoke test: a reduced problem and the first feasible solution are enough.
+    # Shallow copies keep the shared bundle untouched.
+    staff = [
+        {**s, "min_hours_per_week": 40}  # Force high expected hours
+        for s in staff_template[:10]
+    ]
+    shifts = shift_template[:6]
+    constraints = {
+        **constraint_template,
+        "solver_config": {
+            "time_limit_s": 1,
+            "num_workers": 1,
+            "first_solution_only": True,
+        },
+    }
+
+    result = solver.generate_schedule(data=(staff, shifts, constraints))
     assert result is not None
 
     # Expect that schedule still returns, even if some underscheduling occurs